@@ -1,6 +1,5 @@
 # ecom_analytics.py
 import streamlit as st
-import pandas as pd
 import os
 import sys
 from pathlib import Path
@@ -15,8 +14,8 @@ from modules.analyzer import EcommerceAnalyzer, AnalysisConfig
 from modules.visualizer import EcommerceVisualizer, ChartConfig
 from modules.reporter import ReportGenerator
 from utils.validators import EcommerceValidators
-from utils.helpers import validate_file_upload, prepare_dataframe_display
-from utils.exporters import EcommerceExporters
+from utils.helpers import validate_file_upload, prepare_dataframe_display, read_uploaded_file
+from utils.exporters import get_exporter
 from utils.translation import Translator, LanguageManager
 
 # ===== تهيئة الصفحة =====
@@ -53,15 +52,10 @@ def main():
 
         # قراءة الملف إلى dataframe
         try:
-            if check['file_type'] == 'csv':
-                df = pd.read_csv(uploaded_file, encoding=check.get('encoding','utf-8'), on_bad_lines='skip')
-            elif check['file_type'] == 'excel':
-                df = pd.read_excel(uploaded_file)
-            elif check['file_type'] == 'json':
-                df = pd.read_json(uploaded_file)
-            else:
+            if check['file_type'] not in ('csv', 'excel', 'json'):
                 st.error(trans("Unsupported file type", "نوع الملف غير مدعوم"))
                 return
+            df = read_uploaded_file(uploaded_file, check['file_type'], encoding=check.get('encoding','utf-8'))
         except Exception as e:
             st.error(trans("Error reading file:", "خطأ في قراءة الملف:") + f" {e}")
             return
@@ -89,23 +83,33 @@ def main():
 
         # تصورات أساسية
         visualizer = EcommerceVisualizer(ChartConfig(language=language))
-        exporters = EcommerceExporters(output_dir="exports")
+        exporters = get_exporter("exports")
         reporter = ReportGenerator(language=language)
 
         # KPIs
+        sales = results.get('sales_performance', {})
+        profile = results.get('store_profile', {})
         kpi = {
-            'total_revenue': results['sales_performance'].get('total_revenue', 0),
-            'average_order_value': results['sales_performance'].get('average_order_value', 0),
-            'total_customers': results['store_profile'].get('unique_customers', 0),
-            'total_products': results['store_profile'].get('unique_products', 0)
+            'total_revenue': sales.get('total_revenue', 0),
+            'average_order_value': sales.get('average_order_value', 0),
+            'total_customers': profile.get('unique_customers', 0),
+            'total_products': profile.get('unique_products', 0)
         }
-        fig_kpi = visualizer.create_kpi_dashboard(kpi)
-        st.plotly_chart(fig_kpi, use_container_width=True)
+        charts = {'kpi': ('create_kpi_dashboard', {'kpi_data': kpi})}
+        has_trend = bool(mapping.get('order_date') and mapping.get('total_amount'))
+        if has_trend:
+            charts['trend'] = ('create_sales_trend_chart', {'df': df, 'date_col': mapping['order_date'],
+                                                            'amount_col': mapping['total_amount']})
+        figures = visualizer.build_dashboard(charts)
+        st.plotly_chart(figures['kpi'], use_container_width=True)
 
         # مبيان اتجاه المبيعات
-        if mapping.get('order_date') and mapping.get('total_amount'):
-            fig_trend = visualizer.create_sales_trend_chart(df, mapping['order_date'], mapping['total_amount'])
-            st.plotly_chart(fig_trend, use_container_width=True)
+        if has_trend:
+            fig_trend = figures['trend']
+            if fig_trend is not None:
+                st.plotly_chart(fig_trend, use_container_width=True)
+            else:
+                st.info(trans("No sales data to plot", "لا توجد بيانات"))
 
         # تصدير تقرير (نصّي) وملف Excel
         report_text = reporter.generate_report(results, store_type)
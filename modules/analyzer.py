@@ -1,5 +1,8 @@
 # modules/analyzer.py
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, Any
 
@@ -10,23 +13,38 @@ class AnalysisConfig:
     language: str = 'ar'
     date_format: str = '%Y-%m-%d'
     min_data_points: int = 5
+    engine: str = 'pandas'  # 'pandas' | 'dask' | 'auto'
+    dask_threshold_mb: int = 1024
+
+def _to_num(s: pd.Series) -> pd.Series:
+    # الأعمدة الرقمية أصلاً (شائعة في تصديرات SQL) لا تحتاج مسحاً جديداً عبر to_numeric
+    if pd.api.types.is_numeric_dtype(s):
+        return s
+    return pd.to_numeric(s, errors='coerce')
 
 class EcommerceAnalyzer:
     def __init__(self, config: AnalysisConfig = None):
         self.config = config or AnalysisConfig()
         self.dataframe = None
         self.mapping = {}
+        self._stats = {}
 
     def analyze(self, df: pd.DataFrame, mapping: Dict[str,str]) -> Dict[str,Any]:
         self.dataframe = df.copy()
         self.mapping = mapping
         self._clean_data()
-        results = {
-            'store_profile': self._profile(),
-            'sales_performance': self._sales_performance(),
-            'customer_analysis': self._customers(),
-            'data_quality': self._data_quality()
+        self._stats = self._dask_stats() if self._use_dask() else self._core_stats()
+        # الأقسام مستقلة وتقرأ أعمدة الإطار فقط، وعمليات pandas/Arrow فيها تحرر الـ GIL
+        sections = {
+            'store_profile': self._profile,
+            'sales_performance': self._sales_performance,
+            'customer_analysis': self._customers,
+            'data_quality': self._data_quality
         }
+        workers = min(len(sections), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(fn) for name, fn in sections.items()}
+            results = {name: f.result() for name, f in futures.items()}
         return results
 
     def _clean_data(self):
@@ -35,13 +53,20 @@ class EcommerceAnalyzer:
             col = self.mapping['order_date']
             try:
                 self.dataframe[col] = pd.to_datetime(self.dataframe[col], errors='coerce')
-            except:
+            except (ValueError, TypeError, OverflowError):
                 pass
         # تحويل رقمي
         for logical in ['quantity','unit_price','total_amount']:
             if logical in self.mapping:
                 col = self.mapping[logical]
-                self.dataframe[col] = pd.to_numeric(self.dataframe[col], errors='coerce')
+                self.dataframe[col] = _to_num(self.dataframe[col])
+
+        # أعمدة المعرفات النصية: string[pyarrow] يجعل nunique/value_counts تعمل بنواة Arrow بدل كائنات بايثون
+        for logical in ['customer_id','product_id','product_name']:
+            if logical in self.mapping:
+                col = self.mapping[logical]
+                if pd.api.types.is_object_dtype(self.dataframe[col]):
+                    self.dataframe[col] = self.dataframe[col].astype('string[pyarrow]')
 
         # إذا لم يوجد total_amount وحضر unit_price و quantity، احسبه
         if 'total_amount' not in self.mapping and 'unit_price' in self.mapping and 'quantity' in self.mapping:
@@ -49,6 +74,63 @@ class EcommerceAnalyzer:
             self.dataframe['__calc_total'] = self.dataframe[up].fillna(0) * self.dataframe[q].fillna(0)
             self.mapping['total_amount'] = '__calc_total'
 
+    def _use_dask(self) -> bool:
+        engine = self.config.engine
+        if engine == 'auto':
+            size_mb = self.dataframe.memory_usage(deep=True).sum() / (1024*1024)
+            engine = 'dask' if size_mb > self.config.dask_threshold_mb else 'pandas'
+        if engine != 'dask':
+            return False
+        try:
+            import dask.dataframe  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _stat_tasks(self) -> Dict[str,tuple]:
+        # المجاميع المستقلة التي تحتاجها الأقسام: المفتاح -> (العمود، دالة التجميع)
+        tasks = {}
+        if 'customer_id' in self.mapping:
+            tasks['unique_customers'] = (self.mapping['customer_id'], 'nunique')
+        if 'product_id' in self.mapping:
+            tasks['unique_products'] = (self.mapping['product_id'], 'nunique')
+        if 'total_amount' in self.mapping:
+            tasks['total_revenue'] = (self.mapping['total_amount'], 'sum')
+        if 'order_date' in self.mapping:
+            col = self.mapping['order_date']
+            if pd.api.types.is_datetime64_any_dtype(self.dataframe[col]):
+                tasks['date_min'] = (col, 'min')
+                tasks['date_max'] = (col, 'max')
+        return tasks
+
+    def _core_stats(self) -> Dict[str,Any]:
+        # استدعاء agg واحد بقاموس أعمدة بدل مرور منفصل على كل عمود داخل كل قسم
+        tasks = self._stat_tasks()
+        if not tasks:
+            return {}
+        spec = {}
+        for col, func in tasks.values():
+            funcs = spec.setdefault(col, [])
+            if func not in funcs:
+                funcs.append(func)
+        stats = self.dataframe.agg(spec)
+        return {key: stats.loc[func, col] for key, (col, func) in tasks.items()}
+
+    def _dask_stats(self) -> Dict[str,Any]:
+        # كل المجاميع الثقيلة في رسم مهام واحد يُنفَّذ بـ compute واحد موزع على الأنوية
+        import dask
+        import dask.dataframe as dd
+        tasks = self._stat_tasks()
+        if not tasks:
+            return {}
+        ddf = dd.from_pandas(self.dataframe, npartitions=(os.cpu_count() or 1) * 2)
+        values = dask.compute(*(getattr(ddf[col], func)() for col, func in tasks.values()))
+        return dict(zip(tasks, values))
+
+    def _stat(self, key: str, compute):
+        # قيمة محسوبة مسبقاً في _stats إن وُجدت، وإلا الحساب المباشر على العمود
+        return self._stats[key] if key in self._stats else compute()
+
     def _profile(self):
         df = self.dataframe
         profile = {
@@ -59,22 +141,31 @@ class EcommerceAnalyzer:
             'date_range': {}
         }
         if 'customer_id' in self.mapping:
-            profile['unique_customers'] = int(df[self.mapping['customer_id']].nunique())
+            col = self.mapping['customer_id']
+            profile['unique_customers'] = int(self._stat('unique_customers', lambda: df[col].nunique()))
         if 'product_id' in self.mapping:
-            profile['unique_products'] = int(df[self.mapping['product_id']].nunique())
+            col = self.mapping['product_id']
+            profile['unique_products'] = int(self._stat('unique_products', lambda: df[col].nunique()))
         if 'order_date' in self.mapping:
-            s = df[self.mapping['order_date']]
-            s = pd.to_datetime(s, errors='coerce')
-            s = s.dropna()
-            if not s.empty:
-                profile['date_range'] = {'start': str(s.min().date()), 'end': str(s.max().date())}
+            if 'date_min' in self._stats:
+                start, end = self._stats['date_min'], self._stats['date_max']
+            else:
+                s = df[self.mapping['order_date']]
+                # _clean_data حوّل العمود مسبقاً؛ لا نعيد التحليل إلا إن لم يكن datetime
+                if not pd.api.types.is_datetime64_any_dtype(s):
+                    s = pd.to_datetime(s, errors='coerce')
+                s = s.dropna()
+                start, end = (s.min(), s.max()) if not s.empty else (pd.NaT, pd.NaT)
+            if not pd.isna(start):
+                profile['date_range'] = {'start': str(start.date()), 'end': str(end.date())}
         return profile
 
     def _sales_performance(self):
         df = self.dataframe
         result = {'total_revenue':0.0, 'average_order_value':0.0, 'orders_count': len(df)}
         if 'total_amount' in self.mapping:
-            total = df[self.mapping['total_amount']].fillna(0).sum()
+            col = self.mapping['total_amount']
+            total = self._stat('total_revenue', lambda: df[col].fillna(0).sum())
             result['total_revenue'] = float(total)
             if len(df)>0:
                 result['average_order_value'] = float(total / len(df))
@@ -85,13 +176,17 @@ class EcommerceAnalyzer:
         res = {}
         if 'customer_id' in self.mapping:
             cust = df[self.mapping['customer_id']].dropna()
-            res['unique_customers'] = int(cust.nunique())
+            # factorize + bincount: مرور تجزئة واحد يعطي عدد العملاء وطلبات كل عميل معاً دون فرز
+            codes, _ = pd.factorize(cust)
+            counts = np.bincount(codes)
+            res['unique_customers'] = int(len(counts))
             # معدلات تكرار طلبات
-            orders_per_customer = cust.value_counts().describe().to_dict()
+            orders_per_customer = pd.Series(counts).describe().to_dict()
             res['orders_per_customer_summary'] = {k:str(v) for k,v in orders_per_customer.items()}
         return res
 
     def _data_quality(self):
         df = self.dataframe
-        missing = df.isna().mean().to_dict()
+        # عدد المفقود (الصفوف ناقص count()) مقسوماً على عدد الصفوف، دون بناء مصفوفة isna() بحجم الجدول
+        missing = ((len(df) - df.count()) / len(df)).to_dict()
         return {'missing_rate_per_column': {k: float(v) for k,v in missing.items()}}
\ No newline at end of file
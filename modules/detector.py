@@ -23,14 +23,15 @@ class StoreTypeDetector:
     }
 
     def detect(self, df: pd.DataFrame) -> Tuple[str, Dict[str,int]]:
-        cols = [str(c).lower() for c in df.columns]
+        # أسماء الأعمدة في نص واحد مفصول بأسطر: بحث substring واحد لكل كلمة بدل حلقة على الأعمدة
+        cols_text = "\n".join(str(c).lower() for c in df.columns)
         scores = {k:0 for k in SUPPORTED_STORES}
         sample = df.head(50).astype(str).fillna('').values.flatten()
         sample_text = " ".join(sample).lower()
 
         for store, patt in self.STORE_PATTERNS.items():
             for kw in patt.get('column_keywords',[]):
-                if any(kw in c for c in cols):
+                if kw in cols_text:
                     scores[store] += 3
             for ind in patt.get('value_indicators',[]):
                 if ind in sample_text:
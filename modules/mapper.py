@@ -1,7 +1,67 @@
 # modules/mapper.py
 import re
+import numpy as np
 import pandas as pd
-from typing import Dict
+from functools import lru_cache
+from scipy.optimize import linear_sum_assignment
+from typing import Dict, Tuple
+
+def _fuse(alts: Tuple[re.Pattern, ...]):
+    # نمط واحد يجمع البدائل إن أمكن بأمان: أعلام عامة مثل (?i) داخل البديل أو مجموعات التقاط
+    # (يُعاد ترقيمها فتنكسر المراجع الخلفية) تجعله None فيُبحث بالبدائل واحداً واحداً
+    if any(alt.groups for alt in alts):
+        return None
+    try:
+        return re.compile('|'.join(f'(?:{alt.pattern})' for alt in alts), re.IGNORECASE)
+    except re.error:
+        return None
+
+def _compile_patterns(patterns: Dict) -> Tuple[Tuple[str, re.Pattern, Tuple[re.Pattern, ...]], ...]:
+    # كل بديل مترجم منفرداً (فيُرفض النمط غير الصالح كما في البحث المباشر)، ومعه نمط موحّد للحقل
+    # حين يكون آمناً: بحث واحد لكل (عمود، حقل) بدل بحث لكل نمط
+    compiled = []
+    for logical, pats in patterns.items():
+        alts = tuple(re.compile(p, re.IGNORECASE) for p in pats)
+        compiled.append((logical, _fuse(alts), alts))
+    return tuple(compiled)
+
+def _score_matrix(columns: Tuple[str, ...], compiled: Tuple[Tuple[str, re.Pattern, Tuple[re.Pattern, ...]], ...]) -> np.ndarray:
+    # مصفوفة (أعمدة × حقول) منطقية: عمود لكل حقل عبر str.contains المتجهة بدل حلقتين في بايثون
+    names = pd.Series(columns, dtype=object)
+    return np.column_stack([
+        names.str.contains(union, regex=True).to_numpy(dtype=bool) if union is not None
+        else np.array([any(alt.search(c) for alt in alts) for c in columns], dtype=bool)
+        for _, union, alts in compiled
+    ])
+
+def _preference(columns: Tuple[str, ...], compiled: Tuple[Tuple[str, re.Pattern, Tuple[re.Pattern, ...]], ...],
+                hits: np.ndarray) -> np.ndarray:
+    # تفضيل كل حقل لأعمدته المطابقة في (0، 1): أولاً دقة النمط (البديل الأسبق في القائمة أدق)، ثم العمود الأسبق
+    n = len(columns)
+    pref = np.zeros(hits.shape)
+    for i, j in zip(*np.nonzero(hits)):
+        alts = compiled[j][2]
+        k = next(k for k, alt in enumerate(alts) if alt.search(columns[i]))
+        pref[i, j] = (len(alts) - 1 - k + (n - i) / (n + 1)) / len(alts)
+    return pref
+
+@lru_cache(maxsize=128)
+def _match_names(columns: Tuple[str, ...], compiled: Tuple[Tuple[str, re.Pattern, Tuple[re.Pattern, ...]], ...]) -> Tuple[Tuple[str, str], ...]:
+    # المطابقة بالأسماء لا تعتمد على القيم، فتُحفظ لكل مخطط أعمدة وتُعاد مباشرة عند تكراره
+    if not columns or not compiled:
+        return ()
+    hits = _score_matrix(columns, compiled)
+    # تعيين أمثل (خوارزمية المجري) بدل أول تطابق: لا يستولي حقل على عمود هو الأنسب لحقل آخر.
+    # الهدف الأول أكبر عدد من الحقول المعيّنة؛ مجموع التفضيلات أقل من 1 فلا يرجّح إلا بين التعيينات المتساوية فيه
+    scores = hits + _preference(columns, compiled, hits) / (len(compiled) + 1)
+    rows, fields = linear_sum_assignment(scores, maximize=True)
+    assigned = {j: i for i, j in zip(rows, fields) if hits[i, j]}
+    # حقل بقي بلا عمود رغم وجود تطابق (أعمدة أقل من الحقول، مثل total_price لـ unit_price و total_amount)
+    # يأخذ أول عمود مطابق ولو كان مستخدماً
+    for j in range(len(compiled)):
+        if j not in assigned and hits[:, j].any():
+            assigned[j] = int(np.argmax(hits[:, j]))
+    return tuple((compiled[j][0], columns[assigned[j]]) for j in sorted(assigned))
 
 class EcommerceColumnMapper:
     """تعيين أعمدة ذكي بسيط"""
@@ -19,20 +79,16 @@ class EcommerceColumnMapper:
 
     def __init__(self, patterns: Dict = None):
         self.patterns = patterns or self.DEFAULT_PATTERNS
+        # الأنماط الافتراضية مترجمة مرة واحدة لكل العملية؛ المخصصة (أو المعدّلة في صنف فرعي) تُترجم هنا
+        if self.patterns is EcommerceColumnMapper.DEFAULT_PATTERNS:
+            self._compiled = _DEFAULT_COMPILED
+        else:
+            self._compiled = _compile_patterns(self.patterns)
 
     def auto_map(self, df: pd.DataFrame) -> Dict[str,str]:
-        cols = [str(c) for c in df.columns]
-        cols_lower = [c.lower() for c in cols]
-        mapping = {}
-
-        for logical, pats in self.patterns.items():
-            for i,c in enumerate(cols_lower):
-                for p in pats:
-                    if re.search(p, c, flags=re.IGNORECASE):
-                        mapping[logical] = cols[i]
-                        break
-                if logical in mapping:
-                    break
+        # الأنماط مترجمة بـ IGNORECASE، فلا حاجة لنسخة مصغّرة الأحرف من الأسماء
+        cols = tuple(str(c) for c in df.columns)
+        mapping = dict(_match_names(cols, self._compiled))
         # إذا لم يعثر على 'total_amount' حاول حسابه
         if 'total_amount' not in mapping:
             # حاول العثور على price و quantity لعمل combo لاحقاً
@@ -40,6 +96,8 @@ class EcommerceColumnMapper:
                 mapping['total_amount'] = mapping['unit_price']  # ستتعامل analyzer مع الحساب
         return mapping
 
+_DEFAULT_COMPILED = _compile_patterns(EcommerceColumnMapper.DEFAULT_PATTERNS)
+
 # Alias للتوافق مع استيراد سابق اسمه ColumnMapper
 class ColumnMapper(EcommerceColumnMapper):
     pass
\ No newline at end of file
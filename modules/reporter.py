@@ -2,23 +2,42 @@
 from datetime import datetime
 from typing import Dict
 
+# فواصل ثابتة تُبنى مرة واحدة عند الاستيراد بدل كل تقرير
+_SEP = "=" * 60
+# قالب الترويسة يُعدّ مسبقاً ويُملأ بـ format_map
+_HEADER = "\n".join([_SEP, "{title}", _SEP, "Generated: {generated}", "Store type: {store_type}"])
+_TITLES = {'en': "E-commerce Analysis Report", 'ar': "تقرير تحليل المتجر الإلكتروني"}
+
+def _kv_lines(data: Dict):
+    return (f"{k}: {v}" for k,v in data.items())
+
+def _raw_lines(data: Dict):
+    return (str(data),)
+
+# ترتيب الأقسام كجدول بيانات: (عنوان القسم، مفتاح النتائج، دالة العرض)؛ القسم الغائب من النتائج يُتخطى
+_SECTIONS = (
+    ("Profile", 'store_profile', _kv_lines),
+    ("Sales", 'sales_performance', _kv_lines),
+    ("Data quality", 'data_quality', _raw_lines)
+)
+
 class ReportGenerator:
     def __init__(self, language: str = 'ar'):
         self.language = language
+        # اللغة ثابتة طوال عمر المولد، فيُحسم العنوان مرة واحدة هنا
+        self._title = _TITLES.get(language, _TITLES['ar'])
 
     def generate_report(self, analysis_results: Dict, store_type: str) -> str:
-        title = "E-commerce Analysis Report" if self.language=='en' else "تقرير تحليل المتجر الإلكتروني"
-        lines = [("="*60), title, "="*60]
-        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        lines.append(f"Store type: {store_type}")
-        lines.append("\n-- Profile --")
-        for k,v in analysis_results.get('store_profile',{}).items():
-            lines.append(f"{k}: {v}")
-        lines.append("\n-- Sales --")
-        for k,v in analysis_results.get('sales_performance',{}).items():
-            lines.append(f"{k}: {v}")
-        lines.append("\n-- Data quality --")
-        dq = analysis_results.get('data_quality',{})
-        lines.append(str(dq))
+        lines = [_HEADER.format_map({
+            'title': self._title,
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'store_type': store_type
+        })]
+        for heading, key, render in _SECTIONS:
+            data = analysis_results.get(key)
+            if data is None:
+                continue
+            lines.append(f"\n-- {heading} --")
+            lines.extend(render(data))
         lines.append("\nEnd of report")
-        return "\n".join(lines)
\ No newline at end of file
+        return "\n".join(lines)
@@ -1,9 +1,19 @@
 # modules/visualizer.py
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
+import hashlib
+import json
+import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
 @dataclass
 class ChartConfig:
@@ -12,31 +22,186 @@ class ChartConfig:
     width: int = 900
     height: int = 420
     language: str = 'ar'
+    webgl_threshold: int = 500
+    max_points: int = 2000
+    marker_threshold: int = 180
+    cache_dir: Optional[str] = None
+    date_format: Optional[str] = None
+
+# صيغ شائعة تُجرَّب على أول قيمة عند غياب date_format؛ الشهر قبل اليوم كما في استنتاج pandas الافتراضي
+_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y/%m/%d', '%m/%d/%Y', '%d/%m/%Y', '%d-%m-%Y')
+
+def _fits(value, fmt: str) -> bool:
+    try:
+        datetime.strptime(value, fmt)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: فهارس n_out نقطة تحفظ شكل المنحنى (الأولى والأخيرة دائماً)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xf = np.asarray(x, dtype=np.float64)
+    yf = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xf[hi:nxt_hi].mean(), yf[hi:nxt_hi].mean()
+        # مساحة المثلث (النقطة المختارة سابقاً، نقطة المجموعة، متوسط المجموعة التالية)
+        area = np.abs((xf[a] - avg_x) * (yf[lo:hi] - yf[a]) - (xf[a] - xf[lo:hi]) * (avg_y - yf[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+@lru_cache(maxsize=None)
+def _template_json(theme: str) -> str:
+    # plotly.js لا يعرف أسماء القوالب، فتُحل مرة واحدة لكل قالب؛ تُحفظ نصاً حتى لا يشارك المستدعون قاموساً قابلاً للتعديل
+    return json.dumps(pio.templates[theme].to_plotly_json())
+
+def _template_spec(theme: str) -> Dict:
+    return json.loads(_template_json(theme))
+
+def _kpi_spec(items, height: int, theme: str) -> Dict:
+    data = [{'type': 'indicator', 'mode': 'number+delta' if i == 0 else 'number', 'value': v,
+             'title': {'text': k}, 'domain': {'row': 0, 'column': i}} for i, (k, v) in enumerate(items)]
+    layout = {'grid': {'rows': 1, 'columns': len(items)}, 'height': height, 'template': _template_spec(theme)}
+    return {'data': data, 'layout': layout}
+
+@lru_cache(maxsize=128)
+def _kpi_figure_json(items: Tuple[Tuple[str, float], ...], height: int, theme: str) -> str:
+    # تحديث اللوحة بنفس المؤشرات يعيد JSON المحفوظ بدل بناء المؤشرات والقالب من جديد
+    # المؤشرات تُمرَّر دفعة واحدة كقواميس: مرور تدقيق واحد بدل add_trace لكل بطاقة
+    return go.Figure(_kpi_spec(items, height, theme)).to_json()
+
+class AggregationCache:
+    """ذاكرة Feather للسلاسل المجمّعة، مفتاحها بصمة أعمدة الإدخال"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, df: pd.DataFrame, cols: Tuple[str, ...], *extra) -> str:
+        # hash_pandas_object أرخص بكثير من تحليل التواريخ والتجميع اللذين تعفي منهما الإصابة
+        fingerprint = int(pd.util.hash_pandas_object(df[list(cols)], index=False).sum())
+        return hashlib.sha1(repr((len(df), cols, fingerprint) + extra).encode()).hexdigest()
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        path = self.cache_dir / f"{key}.feather"
+        if not path.exists():
+            return None
+        try:
+            return feather.read_table(path).to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            return None
+
+    def save(self, key: str, frame: pd.DataFrame):
+        feather.write_feather(frame, self.cache_dir / f"{key}.feather", compression='zstd')
 
 class EcommerceVisualizer:
     def __init__(self, config: ChartConfig = None):
         self.config = config or ChartConfig()
+        self._date_formats = {}
+        # إعدادات التخطيط المشتركة تُبنى مرة واحدة وتُمرَّر مع البيانات عند إنشاء الشكل بدل update_layout لاحق
+        self._base_layout = {'height': self.config.height, 'template': self.config.theme}
+        self._cache = AggregationCache(self.config.cache_dir) if self.config.cache_dir else None
+
+    def _layout(self, **over) -> Dict:
+        return {**self._base_layout, **over}
+
+    def _date_format(self, s: pd.Series, col: str) -> Optional[str]:
+        # الصيغة المكتشفة تُحفظ لكل عمود، ويُعاد الاكتشاف فقط إن لم تطابق أول قيمة في الإطار الجديد
+        if self.config.date_format:
+            return self.config.date_format
+        idx = s.first_valid_index()
+        if idx is None:
+            return None
+        first = s.loc[idx]
+        fmt = self._date_formats.get(col)
+        if fmt and _fits(first, fmt):
+            return fmt
+        fmt = next((f for f in _DATE_FORMATS if _fits(first, f)), None)
+        self._date_formats[col] = fmt
+        return fmt
+
+    def _parse_dates(self, s: pd.Series, col: str) -> pd.Series:
+        if pd.api.types.is_datetime64_any_dtype(s):
+            return s
+        # format صريح يسلك مسار C السريع بدل الاستنتاج لكل صف، و cache يحلل القيم المتكررة مرة واحدة
+        return pd.to_datetime(s, format=self._date_format(s, col), errors='coerce', cache=True)
+
+    def build_dashboard(self, payload: Dict[str, Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        # payload: اسم الشكل -> (اسم دالة create_*، معاملاتها). الأشكال مستقلة، وتجميعات numpy/pandas فيها تحرر الـ GIL
+        if not payload:
+            return {}
+        workers = max(1, min(len(payload), 8, os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(getattr(self, method), **kwargs) for name, (method, kwargs) in payload.items()}
+            return {name: future.result() for name, future in futures.items()}
 
     def create_kpi_dashboard(self, kpi_data: Dict):
-        fig = go.Figure()
-        labels = list(kpi_data.keys())
-        values = [kpi_data[k] or 0 for k in labels]
-        # use bar of 1 row: simple numeric cards via indicators
-        for i,(k,v) in enumerate(kpi_data.items()):
-            fig.add_trace(go.Indicator(
-                mode="number+delta" if i==0 else "number",
-                value=v,
-                title={'text':k},
-                domain={'row':0,'column':i}
-            ))
-        fig.update_layout(grid={'rows':1,'columns':len(kpi_data)}, height=self.config.height, template=self.config.theme)
-        return fig
+        # ترتيب المؤشرات جزء من المفتاح لأنه يحدد ترتيب البطاقات
+        return pio.from_json(_kpi_figure_json(tuple(kpi_data.items()), self.config.height, self.config.theme))
+
+    def create_kpi_dashboard_spec(self, kpi_data: Dict) -> Dict:
+        # مواصفة Plotly كقاموس عادي لمن يرسلها مباشرة (websocket / dcc.Graph) دون مرور مدقق graph_objects ثم to_json
+        return _kpi_spec(list(kpi_data.items()), self.config.height, self.config.theme)
+
+    def _daily_totals(self, df: pd.DataFrame, date_col: str, amount_col: str) -> pd.DataFrame:
+        ts = self._parse_dates(df[date_col], date_col)
+        # الأيام بالتوقيت المحلي للعمود لا UTC: إزالة المنطقة تحفظ الساعة المحلية، وتُعاد للتواريخ الناتجة
+        tz = ts.dt.tz if isinstance(ts.dtype, pd.DatetimeTZDtype) else None
+        if tz is not None:
+            ts = ts.dt.tz_localize(None)
+        valid = ts.notna().to_numpy()
+        days = ts.to_numpy()[valid].astype('datetime64[D]')
+        amounts = pd.to_numeric(df[amount_col], errors='coerce').fillna(0).to_numpy(np.float64)[valid]
+        # مجموع يومي بـ bincount على إزاحة اليوم: مرور واحد دون نسخ الإطار أو فرزه، والأيام الفارغة صفر كما في Grouper
+        if len(days):
+            start = days.min()
+            sums = np.bincount((days - start).astype(np.int64), weights=amounts)
+            dates = (start + np.arange(len(sums))).astype('datetime64[ns]')
+        else:
+            sums, dates = np.empty(0), np.empty(0, dtype='datetime64[ns]')
+        if tz is not None:
+            # منتصف ليل غير موجود (بدء التوقيت الصيفي عنده كالقاهرة وبيروت) يُزاح لأول لحظة في اليوم،
+            # والمكرر (نهايته عنده) يؤخذ بأول حدوث له
+            dates = pd.DatetimeIndex(dates).tz_localize(tz, nonexistent='shift_forward',
+                                                        ambiguous=np.ones(len(dates), dtype=bool))
+        return pd.DataFrame({date_col: dates, amount_col: sums})
 
     def create_sales_trend_chart(self, df: pd.DataFrame, date_col: str, amount_col: str):
-        df2 = df.copy()
-        df2[date_col] = pd.to_datetime(df2[date_col], errors='coerce')
-        df2 = df2.dropna(subset=[date_col])
-        daily = df2.groupby(pd.Grouper(key=date_col, freq='D'))[amount_col].sum().reset_index()
-        fig = px.line(daily, x=date_col, y=amount_col, title="Sales Trend")
-        fig.update_layout(height=self.config.height, template=self.config.theme)
-        return fig
\ No newline at end of file
+        if self._cache is None:
+            daily = self._daily_totals(df, date_col, amount_col)
+        else:
+            # نفس البيانات عبر الجلسات: تحميل السلسلة المجمّعة من القرص بدل إعادة التحليل والتجميع
+            key = self._cache.key(df, (date_col, amount_col), self.config.date_format)
+            daily = self._cache.load(key)
+            if daily is None:
+                daily = self._daily_totals(df, date_col, amount_col)
+                self._cache.save(key, daily)
+        # لا تواريخ صالحة أو مبيعات صفرية بالكامل: لا داعي لبناء شكل فارغ وتمريره عبر مدقق Plotly
+        if not np.any(daily[amount_col].to_numpy()):
+            return None
+        # تقليص النقاط قبل Plotly: عمود البكسل لا يعرض أكثر من نقطة، والباقي حمولة JSON ورسم بلا فائدة
+        if len(daily) > self.config.max_points:
+            keep = _lttb(np.arange(len(daily)), daily[amount_col].to_numpy(), self.config.max_points)
+            daily = daily.iloc[keep]
+        # WebGL للسلاسل الطويلة حيث يصبح رسم SVG في المتصفح هو عنق الزجاجة؛ SVG أوضح للقصيرة
+        trace = go.Scattergl if len(daily) >= self.config.webgl_threshold else go.Scatter
+        # علامة لكل نقطة مفيدة في السلاسل القصيرة فقط؛ في الطويلة يكفي الخط ويكبّر المستخدم عبر شريط المدى
+        mode = 'lines+markers' if len(daily) <= self.config.marker_threshold else 'lines'
+        # uirevision ثابت يحفظ التكبير ونطاق الشريط عند إعادة الرسم
+        layout = self._layout(title={'text': "Sales Trend"},
+                              xaxis={'title': {'text': date_col}, 'rangeslider': {'visible': True}},
+                              yaxis={'title': {'text': amount_col}}, uirevision='sales-trend')
+        x = daily[date_col].to_numpy()
+        y = daily[amount_col].to_numpy()
+        # التلميح يقرّب لسنتين فلا تظهر بقايا الجمع العشري مثل 0.30000000000000004
+        return go.Figure(data=[trace(x=x, y=y, mode=mode, name=amount_col,
+                                     hovertemplate='%{x|%Y-%m-%d}<br>%{y:,.2f}')], layout=layout)
\ No newline at end of file
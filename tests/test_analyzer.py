@@ -0,0 +1,101 @@
+"""
+اختبار وحدة تحليل المتجر
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from modules.analyzer import EcommerceAnalyzer, AnalysisConfig
+
+
+class TestEcommerceAnalyzer:
+    """اختبار محلل المتجر"""
+
+    def setup_method(self):
+        """تهيئة قبل كل اختبار"""
+        self.analyzer = EcommerceAnalyzer(AnalysisConfig(store_type='fashion'))
+        self.df = pd.DataFrame({
+            'order_id': [1, 2, 3, 4],
+            'order_date': ['2024-01-01', '2024-01-05', None, '2024-02-01'],
+            'customer_id': ['c1', 'c2', 'c1', None],
+            'product_id': ['p1', 'p1', 'p2', 'p3'],
+            'total_amount': ['100', '50.5', 'x', 49.5]
+        })
+        self.mapping = {
+            'order_id': 'order_id',
+            'order_date': 'order_date',
+            'customer_id': 'customer_id',
+            'product_id': 'product_id',
+            'total_amount': 'total_amount'
+        }
+
+    def test_analyze_sections(self):
+        """اختبار وجود جميع أقسام التحليل"""
+        results = self.analyzer.analyze(self.df, self.mapping)
+
+        assert list(results) == ['store_profile', 'sales_performance', 'customer_analysis', 'data_quality']
+
+    def test_store_profile(self):
+        """اختبار ملف المتجر"""
+        profile = self.analyzer.analyze(self.df, self.mapping)['store_profile']
+
+        assert profile['store_type'] == 'fashion'
+        assert profile['total_orders'] == 4
+        assert profile['unique_customers'] == 2
+        assert profile['unique_products'] == 3
+        assert profile['date_range'] == {'start': '2024-01-01', 'end': '2024-02-01'}
+
+    def test_sales_performance(self):
+        """اختبار أداء المبيعات مع قيم غير رقمية"""
+        sales = self.analyzer.analyze(self.df, self.mapping)['sales_performance']
+
+        assert sales['total_revenue'] == pytest.approx(200.0)
+        assert sales['average_order_value'] == pytest.approx(50.0)
+
+    def test_customer_analysis(self):
+        """اختبار تحليل العملاء"""
+        customers = self.analyzer.analyze(self.df, self.mapping)['customer_analysis']
+
+        assert customers['unique_customers'] == 2
+        assert float(customers['orders_per_customer_summary']['max']) == 2.0
+
+    def test_data_quality(self):
+        """اختبار نسب القيم المفقودة"""
+        quality = self.analyzer.analyze(self.df, self.mapping)['data_quality']
+
+        assert quality['missing_rate_per_column']['order_date'] == pytest.approx(0.25)
+        assert quality['missing_rate_per_column']['order_id'] == 0.0
+
+    def test_data_quality_exact_rates(self):
+        """اختبار أن نسب القيم المفقودة مطابقة تماماً لـ isna().mean()"""
+        df = pd.DataFrame({'a': [1, None, 3, 4, 5], 'b': [None, None, 'x', 'y', 'z']})
+        quality = self.analyzer.analyze(df, {})['data_quality']['missing_rate_per_column']
+
+        assert quality['a'] == 0.2
+        assert quality == df.isna().mean().to_dict()
+
+    def test_calculated_total(self):
+        """اختبار حساب الإجمالي من السعر والكمية"""
+        df = pd.DataFrame({'price': [10.0, 20.0, np.nan], 'qty': [1, 2, 3]})
+        results = self.analyzer.analyze(df, {'unit_price': 'price', 'quantity': 'qty'})
+
+        assert results['sales_performance']['total_revenue'] == pytest.approx(50.0)
+
+    def test_dask_engine_matches_pandas(self):
+        """اختبار تطابق مسار dask مع مسار pandas"""
+        pytest.importorskip('dask.dataframe')
+        expected = self.analyzer.analyze(self.df, dict(self.mapping))
+        analyzer = EcommerceAnalyzer(AnalysisConfig(store_type='fashion', engine='dask'))
+
+        assert analyzer.analyze(self.df, dict(self.mapping)) == expected
+
+    def test_does_not_modify_input(self):
+        """اختبار عدم تعديل الإطار الأصلي"""
+        original = self.df.copy()
+        self.analyzer.analyze(self.df, self.mapping)
+
+        pd.testing.assert_frame_equal(self.df, original)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
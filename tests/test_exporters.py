@@ -0,0 +1,114 @@
+"""
+اختبار وحدة التصدير
+"""
+
+import shutil
+import pytest
+import pandas as pd
+import pyarrow.parquet as pq
+from utils import exporters
+from utils.exporters import EcommerceExporters
+
+
+class TestEcommerceExporters:
+    """اختبار مصدّر البيانات"""
+
+    def setup_method(self):
+        """تهيئة قبل كل اختبار"""
+        self.df = pd.DataFrame({
+            'order_id': [1, 2, 3],
+            'product_name': ['قميص', 'بنطلون', None],
+            'total_amount': [10.5, 20.0, 7.25]
+        })
+
+    def test_export_excel_roundtrip(self, tmp_path):
+        """اختبار تصدير Excel واسترجاع كل الخلايا"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='excel')
+
+        assert info['success']
+        assert info['file_name'].endswith('.xlsx')
+        pd.testing.assert_frame_equal(pd.read_excel(info['file_path'], sheet_name='data'), self.df,
+                                      check_dtype=False)
+
+    def test_export_excel_fast_path(self, tmp_path, monkeypatch):
+        """اختبار المسار السريع عبر pyexcelerate"""
+        pytest.importorskip('pyexcelerate')
+        monkeypatch.setattr(exporters, '_FAST_EXCEL_MIN_ROWS', 0)
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='excel', fast=True)
+
+        assert info['success']
+        pd.testing.assert_frame_equal(pd.read_excel(info['file_path'], sheet_name='data'), self.df,
+                                      check_dtype=False)
+
+    def test_export_csv_roundtrip(self, tmp_path):
+        """اختبار تصدير CSV"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='csv')
+
+        assert info['success']
+        pd.testing.assert_frame_equal(pd.read_csv(info['file_path']), self.df, check_dtype=False)
+
+    def test_export_csv_gzip_chunked(self, tmp_path):
+        """اختبار تصدير CSV مضغوط على دفعات صغيرة"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='csv',
+                                                                   chunksize=1, csv_compression='gzip')
+
+        assert info['file_name'].endswith('.csv.gz')
+        pd.testing.assert_frame_equal(pd.read_csv(info['file_path']), self.df, check_dtype=False)
+
+    def test_export_csv_unsupported_compression(self, tmp_path):
+        """اختبار ضغط CSV غير مدعوم"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='csv',
+                                                                   csv_compression='bz2')
+
+        assert not info['success']
+        assert 'gzip' in info['message'] and 'zstd' in info['message']
+
+    def test_export_parquet_roundtrip(self, tmp_path):
+        """اختبار تصدير Parquet بضغط zstd"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='parquet')
+
+        assert info['success']
+        meta = pq.ParquetFile(info['file_path']).metadata.row_group(0)
+        assert meta.column(0).compression == 'ZSTD'
+        pd.testing.assert_frame_equal(pd.read_parquet(info['file_path']), self.df, check_dtype=False)
+
+    def test_export_parquet_uncompressed(self, tmp_path):
+        """اختبار تعطيل الضغط"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='parquet',
+                                                                   compression=None)
+
+        assert pq.ParquetFile(info['file_path']).metadata.row_group(0).column(0).compression == 'UNCOMPRESSED'
+
+    def test_get_exporter_cached(self, tmp_path):
+        """اختبار إعادة نسخة المصدّر نفسها لكل مجلد"""
+        first = exporters.get_exporter(str(tmp_path / 'a'))
+
+        assert exporters.get_exporter(str(tmp_path / 'a')) is first
+        assert exporters.get_exporter(str(tmp_path / 'b')) is not first
+
+    def test_get_exporter_recreates_deleted_dir(self, tmp_path):
+        """اختبار إعادة إنشاء مجلد التصدير إذا حُذف بعد تخزين المصدّر"""
+        exporter = exporters.get_exporter(str(tmp_path / 'gone'))
+        for fmt in ('csv', 'excel', 'parquet', 'feather'):
+            shutil.rmtree(tmp_path / 'gone', ignore_errors=True)
+            info = exporter.export_dataframe(self.df, 'data', format=fmt)
+
+            assert info['success'], info
+
+    def test_export_feather_roundtrip(self, tmp_path):
+        """اختبار تصدير Feather"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='feather')
+
+        assert info['file_name'].endswith('.feather')
+        pd.testing.assert_frame_equal(pd.read_feather(info['file_path']), self.df, check_dtype=False)
+
+    def test_unsupported_format(self, tmp_path):
+        """اختبار صيغة غير مدعومة"""
+        info = EcommerceExporters(str(tmp_path)).export_dataframe(self.df, 'data', format='pdf')
+
+        assert not info['success']
+        assert 'parquet' in info['message']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+"""
+اختبار الدوال المساعدة
+"""
+
+import io
+import pytest
+import pandas as pd
+from utils.helpers import read_uploaded_file, prepare_dataframe_display
+
+
+class TestHelpers:
+    """اختبار قراءة الملفات المرفوعة وتجهيز العرض"""
+
+    def test_read_csv_skips_bad_lines(self):
+        """اختبار قراءة CSV مع تخطي الأسطر المعطوبة وتحويل التواريخ"""
+        data = io.BytesIO('order_id,product,order_date\n1,قميص,2024-01-01\n2,x,2024-01-02,extra\n3,فستان,2024-01-03\n'.encode())
+        df = read_uploaded_file(data, 'csv')
+
+        assert list(df['order_id']) == [1, 3]
+        assert list(df['product']) == ['قميص', 'فستان']
+        assert pd.api.types.is_datetime64_any_dtype(df['order_date'])
+
+    def test_read_csv_keeps_short_rows(self):
+        """اختبار إبقاء الأسطر الناقصة مع قيم فارغة كما في pandas"""
+        df = read_uploaded_file(io.BytesIO(b'a,b,c\n1,2,3\n4,5\n6,7,8\n'), 'csv')
+
+        assert list(df['a']) == [1, 4, 6]
+        assert pd.isna(df['c'][1])
+
+    def test_read_csv_invalid_encoding_raises(self):
+        """اختبار رفض بايتات غير صالحة بدل تمريرها كقيم ثنائية"""
+        data = io.BytesIO('order_id,product\n1,قميص\n'.encode('cp1256'))
+
+        with pytest.raises(UnicodeDecodeError):
+            read_uploaded_file(data, 'csv')
+
+    def test_read_csv_matches_pandas(self):
+        """اختبار تطابق القيم الفارغة والإزاحات الزمنية والعناوين المكررة مع read_csv"""
+        text = ('customer_id,when,x,x\n'
+                'c1,2024-01-01T10:00:00+03:00,1,2\n'
+                ',2024-01-02T10:00:00+03:00,3,4\n'
+                'NA,2024-01-03T10:00:00+03:00,5,6\n'
+                'N/A,2024-01-04T10:00:00+03:00,7,8\n')
+        df = read_uploaded_file(io.BytesIO(text.encode()), 'csv')
+
+        pd.testing.assert_frame_equal(df, pd.read_csv(io.StringIO(text)))
+        assert df['customer_id'].isna().sum() == 3
+
+    def test_read_csv_ids_beyond_int64(self):
+        """اختبار عدم دمج المعرفات الأكبر من int64 كما يحدث عند قراءتها float64"""
+        text = 'order_id,amount\n12345678901234567890,1\n12345678901234567891,2\n'
+        df = read_uploaded_file(io.BytesIO(text.encode()), 'csv')
+
+        pd.testing.assert_frame_equal(df, pd.read_csv(io.StringIO(text)))
+        assert df['order_id'].nunique() == 2
+
+    def test_read_csv_arrow_differences_fall_back(self):
+        """اختبار مطابقة read_csv للعناوين الفارغة والأوقات والأعمدة الفارغة كلياً"""
+        text = ',slot,note,amount\n0,10:30:00,,1.5\n1,11:00:00,,2.5\n'
+        df = read_uploaded_file(io.BytesIO(text.encode()), 'csv')
+
+        pd.testing.assert_frame_equal(df, pd.read_csv(io.StringIO(text)))
+        assert list(df.columns) == ['Unnamed: 0', 'slot', 'note', 'amount']
+        assert df['note'].dtype == 'float64'
+
+    def test_read_csv_blank_strings_are_missing(self):
+        """اختبار تحويل الخلايا الفارغة في أعمدة النص إلى NaN في مسار Arrow"""
+        text = 'customer_id,amount\nc1,1\n,2\nNA,3\nc2,\n'
+        df = read_uploaded_file(io.BytesIO(text.encode()), 'csv')
+
+        assert df['customer_id'].isna().tolist() == [False, True, True, False]
+        assert df['amount'].isna().tolist() == [False, False, False, True]
+
+    def test_read_excel(self, tmp_path):
+        """اختبار قراءة Excel"""
+        path = tmp_path / 'data.xlsx'
+        pd.DataFrame({'a': [1, 2]}).to_excel(path, index=False)
+
+        with open(path, 'rb') as f:
+            assert list(read_uploaded_file(f, 'excel')['a']) == [1, 2]
+
+    def test_read_unsupported_type(self):
+        """اختبار نوع غير مدعوم"""
+        with pytest.raises(ValueError):
+            read_uploaded_file(io.BytesIO(b''), 'pdf')
+
+    def test_prepare_dataframe_display(self):
+        """اختبار قص المعاينة"""
+        df = pd.DataFrame({'a': range(150)})
+
+        assert len(prepare_dataframe_display(df)) == 100
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,101 @@
+"""
+اختبار وحدة تعيين الأعمدة
+"""
+
+import warnings
+import pytest
+import pandas as pd
+from modules.mapper import EcommerceColumnMapper, ColumnMapper
+
+
+class TestEcommerceColumnMapper:
+    """اختبار معيّن الأعمدة"""
+
+    def setup_method(self):
+        """تهيئة قبل كل اختبار"""
+        self.mapper = EcommerceColumnMapper()
+
+    def test_map_english_columns(self):
+        """اختبار تعيين أعمدة إنجليزية بحالات أحرف مختلفة"""
+        df = pd.DataFrame(columns=['Order_ID', 'Order Date', 'Customer_ID', 'Email', 'SKU',
+                                   'Product Name', 'Qty', 'Unit Price', 'Total Amount'])
+        mapping = self.mapper.auto_map(df)
+
+        assert mapping == {
+            'order_id': 'Order_ID',
+            'order_date': 'Order Date',
+            'customer_id': 'Customer_ID',
+            'customer_email': 'Email',
+            'product_id': 'SKU',
+            'product_name': 'Product Name',
+            'quantity': 'Qty',
+            'unit_price': 'Unit Price',
+            'total_amount': 'Total Amount'
+        }
+
+    def test_map_arabic_columns(self):
+        """اختبار تعيين أعمدة عربية"""
+        df = pd.DataFrame(columns=['رقم الطلب', 'تاريخ الطلب', 'الكمية', 'المبلغ'])
+        mapping = self.mapper.auto_map(df)
+
+        assert mapping['order_id'] == 'رقم الطلب'
+        assert mapping['order_date'] == 'تاريخ الطلب'
+        assert mapping['quantity'] == 'الكمية'
+        assert mapping['total_amount'] == 'المبلغ'
+
+    def test_one_column_per_field(self):
+        """اختبار عدم تعيين العمود نفسه لحقلين متطابقين معاً"""
+        df = pd.DataFrame(columns=['تاريخ الطلب', 'رقم الطلب'])
+        mapping = self.mapper.auto_map(df)
+
+        assert mapping['order_date'] == 'تاريخ الطلب'
+        assert mapping['order_id'] == 'رقم الطلب'
+
+    def test_exact_column_not_taken_by_other_field(self):
+        """اختبار أن الحقل يأخذ عموده الدقيق ولا يُعطى عمود حقل آخر"""
+        df = pd.DataFrame(columns=['تاريخ الطلب', 'created_at', 'order_id'])
+        mapping = self.mapper.auto_map(df)
+
+        assert mapping == {'order_id': 'order_id', 'order_date': 'created_at'}
+
+    def test_shared_column_when_fields_outnumber_columns(self):
+        """اختبار مشاركة عمود بين حقلين عندما لا يوجد عمود آخر مطابق"""
+        df = pd.DataFrame(columns=['order_id', 'total_price', 'customer_id', 'order_date'])
+        mapping = self.mapper.auto_map(df)
+
+        assert mapping['unit_price'] == 'total_price'
+        assert mapping['total_amount'] == 'total_price'
+        assert mapping['order_id'] == 'order_id'
+
+    def test_no_matches(self):
+        """اختبار أعمدة غير معروفة"""
+        df = pd.DataFrame(columns=['foo', 'bar'])
+
+        assert self.mapper.auto_map(df) == {}
+
+    def test_custom_patterns(self):
+        """اختبار أنماط مخصصة"""
+        mapper = EcommerceColumnMapper(patterns={'order_id': [r'^ref$']})
+        df = pd.DataFrame(columns=['order_id', 'REF'])
+
+        assert mapper.auto_map(df) == {'order_id': 'REF'}
+
+    def test_custom_patterns_with_flags_and_groups(self):
+        """اختبار أنماط مخصصة بأعلام عامة ومجموعات التقاط ومراجع خلفية"""
+        mapper = EcommerceColumnMapper(patterns={'order_id': [r'(?i)ref', r'id'],
+                                                 'product_id': [r'(p)\1_code']})
+        df = pd.DataFrame(columns=['REF_no', 'pp_code'])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            assert mapper.auto_map(df) == {'order_id': 'REF_no', 'product_id': 'pp_code'}
+
+    def test_column_mapper_alias(self):
+        """اختبار الاسم البديل للتوافق"""
+        df = pd.DataFrame(columns=['order_id'])
+
+        assert ColumnMapper().auto_map(df) == {'order_id': 'order_id'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,48 @@
+"""
+اختبار وحدة مولد التقارير
+"""
+
+import pytest
+from modules.reporter import ReportGenerator
+
+
+class TestReportGenerator:
+    """اختبار مولد التقارير النصية"""
+
+    def setup_method(self):
+        """تهيئة قبل كل اختبار"""
+        self.results = {
+            'store_profile': {'total_orders': 10, 'unique_customers': 4},
+            'sales_performance': {'total_revenue': 1500.0},
+            'data_quality': {'missing_rate_per_column': {'order_id': 0.0}}
+        }
+
+    def test_report_title_by_language(self):
+        """اختبار عنوان التقرير حسب اللغة"""
+        report_en = ReportGenerator(language='en').generate_report(self.results, 'fashion')
+        report_ar = ReportGenerator(language='ar').generate_report(self.results, 'fashion')
+
+        assert 'E-commerce Analysis Report' in report_en
+        assert 'تقرير تحليل المتجر الإلكتروني' in report_ar
+
+    def test_report_sections(self):
+        """اختبار محتوى أقسام التقرير"""
+        report = ReportGenerator(language='en').generate_report(self.results, 'fashion')
+
+        assert 'Store type: fashion' in report
+        assert 'total_orders: 10' in report
+        assert 'total_revenue: 1500.0' in report
+        assert "{'missing_rate_per_column': {'order_id': 0.0}}" in report
+        assert report.endswith('End of report')
+
+    def test_missing_sections_skipped(self):
+        """اختبار تخطي الأقسام الغائبة من النتائج"""
+        report = ReportGenerator(language='en').generate_report({'store_profile': {'total_orders': 1}}, 'general')
+
+        assert '-- Profile --' in report
+        assert '-- Sales --' not in report
+        assert '-- Data quality --' not in report
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,162 @@
+"""
+اختبار وحدة الرسوم البيانية
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from modules.visualizer import EcommerceVisualizer, ChartConfig
+
+
+class TestEcommerceVisualizer:
+    """اختبار منشئ الرسوم البيانية"""
+
+    def setup_method(self):
+        """تهيئة قبل كل اختبار"""
+        self.visualizer = EcommerceVisualizer(ChartConfig())
+        self.df = pd.DataFrame({
+            'order_date': ['2024-01-01', '2024-01-01', '2024-01-03', None],
+            'total_amount': [10.0, 5.0, 7.5, 100.0]
+        })
+
+    def test_kpi_dashboard(self):
+        """اختبار لوحة المؤشرات"""
+        kpi = {'total_revenue': 1000, 'total_customers': 50}
+        fig = self.visualizer.create_kpi_dashboard(kpi)
+
+        assert len(fig.data) == 2
+        assert [t.value for t in fig.data] == [1000, 50]
+
+    def test_kpi_dashboard_cached_copies(self):
+        """اختبار أن اللوحة المحفوظة تعود نسخة مستقلة في كل استدعاء"""
+        kpi = {'total_revenue': 1000, 'total_customers': 50}
+        first = self.visualizer.create_kpi_dashboard(kpi)
+        first.update_layout(height=100)
+        second = self.visualizer.create_kpi_dashboard(kpi)
+
+        assert second.layout.height == 420
+        assert [t.title.text for t in second.data] == ['total_revenue', 'total_customers']
+
+    def test_kpi_dashboard_spec(self):
+        """اختبار مواصفة اللوحة كقاموس مطابق للشكل"""
+        kpi = {'total_revenue': 1000, 'total_customers': 50}
+        spec = self.visualizer.create_kpi_dashboard_spec(kpi)
+
+        assert [t['value'] for t in spec['data']] == [1000, 50]
+        assert spec['layout']['grid'] == {'rows': 1, 'columns': 2}
+        fig = go.Figure(spec)
+        assert fig.layout.height == 420
+
+    def test_kpi_dashboard_spec_independent(self):
+        """اختبار أن تعديل مواصفة لا يتسرب إلى المواصفات اللاحقة"""
+        spec = self.visualizer.create_kpi_dashboard_spec({'total_revenue': 1})
+        spec['layout']['template']['layout']['paper_bgcolor'] = 'red'
+        again = self.visualizer.create_kpi_dashboard_spec({'total_revenue': 1})
+
+        assert again['layout']['template']['layout']['paper_bgcolor'] != 'red'
+
+    def test_build_dashboard(self):
+        """اختبار بناء عدة أشكال معاً بالأسماء"""
+        figures = self.visualizer.build_dashboard({
+            'kpi': ('create_kpi_dashboard', {'kpi_data': {'total_revenue': 1000}}),
+            'trend': ('create_sales_trend_chart', {'df': self.df, 'date_col': 'order_date', 'amount_col': 'total_amount'})
+        })
+
+        assert list(figures) == ['kpi', 'trend']
+        assert figures['kpi'].data[0].value == 1000
+        assert list(figures['trend'].data[0].y) == [15.0, 0.0, 7.5]
+
+    def test_sales_trend_daily_totals(self):
+        """اختبار تجميع المبيعات اليومية"""
+        fig = self.visualizer.create_sales_trend_chart(self.df, 'order_date', 'total_amount')
+        trace = fig.data[0]
+
+        assert trace.type == 'scatter'
+        assert trace.mode == 'lines+markers'
+        assert trace.hovertemplate.endswith('%{y:,.2f}')
+        assert list(trace.y) == [15.0, 0.0, 7.5]
+
+    def test_sales_trend_tz_aware_local_days(self):
+        """اختبار تجميع الأعمدة ذات المنطقة الزمنية حسب اليوم المحلي"""
+        dates = pd.to_datetime(['2024-01-01 01:00', '2024-01-01 23:00', '2024-01-02 02:00']).tz_localize('Asia/Riyadh')
+        df = pd.DataFrame({'order_date': dates, 'total_amount': [1.0, 2.0, 4.0]})
+        daily = self.visualizer._daily_totals(df, 'order_date', 'total_amount')
+
+        assert list(daily['total_amount']) == [3.0, 4.0]
+        assert list(daily['order_date']) == list(pd.to_datetime(['2024-01-01', '2024-01-02']).tz_localize('Asia/Riyadh'))
+
+    def test_sales_trend_tz_dst_at_midnight(self):
+        """اختبار الأيام التي يبدأ فيها التوقيت الصيفي عند منتصف الليل"""
+        for tz, day in [('Africa/Cairo', '2023-04-28'), ('Asia/Beirut', '2023-03-26')]:
+            dates = pd.to_datetime([f'{day} 10:00', f'{day} 12:00', '2023-05-01 09:00']).tz_localize(tz)
+            df = pd.DataFrame({'order_date': dates, 'total_amount': [1.0, 2.0, 4.0]})
+            daily = self.visualizer._daily_totals(df, 'order_date', 'total_amount')
+
+            assert daily['total_amount'].iloc[0] == 3.0
+            assert daily['total_amount'].sum() == 7.0
+            assert str(daily['order_date'].iloc[0].date()) == day
+            assert str(daily['order_date'].iloc[-1].date()) == '2023-05-01'
+
+    def test_sales_trend_dirty_amounts(self):
+        """اختبار معاملة المبالغ غير الرقمية كصفر بدل رفع خطأ"""
+        df = pd.DataFrame({'order_date': ['2024-01-01', '2024-01-01', '2024-01-02'],
+                           'total_amount': ['12.5', 'SAR 12', 'n/a']})
+        daily = self.visualizer._daily_totals(df, 'order_date', 'total_amount')
+
+        assert list(daily['total_amount']) == [12.5, 0.0]
+
+    def test_sales_trend_empty_returns_none(self):
+        """اختبار عدم بناء شكل عند غياب المبيعات"""
+        no_dates = pd.DataFrame({'order_date': [None, 'x'], 'total_amount': [1.0, 2.0]})
+        zeros = pd.DataFrame({'order_date': ['2024-01-01'], 'total_amount': [0.0]})
+
+        assert self.visualizer.create_sales_trend_chart(no_dates, 'order_date', 'total_amount') is None
+        assert self.visualizer.create_sales_trend_chart(zeros, 'order_date', 'total_amount') is None
+
+    def test_sales_trend_sniffed_date_format(self):
+        """اختبار اكتشاف صيغة التاريخ وحفظها لكل عمود"""
+        df = pd.DataFrame({'order_date': ['25/01/2024', '26/01/2024'], 'total_amount': [1.0, 2.0]})
+        fig = self.visualizer.create_sales_trend_chart(df, 'order_date', 'total_amount')
+
+        assert list(fig.data[0].y) == [1.0, 2.0]
+        assert self.visualizer._date_formats['order_date'] == '%d/%m/%Y'
+
+    def test_sales_trend_aggregation_cache(self, tmp_path):
+        """اختبار حفظ السلسلة المجمّعة في Feather وإعادة استخدامها"""
+        visualizer = EcommerceVisualizer(ChartConfig(cache_dir=str(tmp_path)))
+        first = visualizer.create_sales_trend_chart(self.df, 'order_date', 'total_amount')
+        files = list(tmp_path.glob('*.feather'))
+        second = EcommerceVisualizer(ChartConfig(cache_dir=str(tmp_path))).create_sales_trend_chart(
+            self.df, 'order_date', 'total_amount')
+
+        assert len(files) == 1
+        assert list(second.data[0].y) == list(first.data[0].y) == [15.0, 0.0, 7.5]
+        assert list(second.data[0].x) == list(first.data[0].x)
+
+    def test_sales_trend_webgl_for_long_series(self):
+        """اختبار استخدام WebGL للسلاسل الطويلة"""
+        dates = pd.date_range('2020-01-01', periods=600, freq='D')
+        df = pd.DataFrame({'order_date': dates, 'total_amount': np.ones(600)})
+        fig = self.visualizer.create_sales_trend_chart(df, 'order_date', 'total_amount')
+
+        assert fig.data[0].type == 'scattergl'
+        assert fig.data[0].mode == 'lines'
+
+    def test_sales_trend_downsampled(self):
+        """اختبار تقليص السلاسل الطويلة مع الإبقاء على الطرفين والذروة"""
+        dates = pd.date_range('2000-01-01', periods=5000, freq='D')
+        amounts = np.ones(5000)
+        amounts[1234] = 99.0
+        df = pd.DataFrame({'order_date': dates, 'total_amount': amounts})
+        fig = EcommerceVisualizer(ChartConfig(max_points=500)).create_sales_trend_chart(df, 'order_date', 'total_amount')
+        trace = fig.data[0]
+
+        assert len(trace.y) == 500
+        assert pd.Timestamp(trace.x[0]) == dates[0]
+        assert pd.Timestamp(trace.x[-1]) == dates[-1]
+        assert max(trace.y) == 99.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -1,28 +1,130 @@
 # utils/exporters.py
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
 import os
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import datetime
 
+# xlsxwriter أسرع وأخف ذاكرة؛ openpyxl احتياط فقط. وضع write_only فيه لا يعمل مع to_excel (يستدعي ws.cell)
+_EXCEL_ENGINE = 'xlsxwriter' if find_spec('xlsxwriter') else 'openpyxl'
+
+# ضغط CSV الاختياري -> امتداد الملف؛ zstd يتطلب حزمة zstandard
+_CSV_SUFFIXES = {None: '.csv', 'gzip': '.csv.gz', 'zstd': '.csv.zst'}
+
+# تحت هذا العدد من الصفوف لا يستحق المسار السريع تحويل الإطار إلى قوائم بايثون
+_FAST_EXCEL_MIN_ROWS = 50_000
+
+# ملفات أصغر من هذا لا تزاحم صفحات التحليل في ذاكرة النظام المؤقتة بما يستحق مزامنة القرص
+_PAGE_CACHE_MIN_BYTES = 64 << 20
+
+def _drop_page_cache(path: Path):
+    # بعد كتابة تصدير كبير: إعادة صفحاته إلى النواة بدل طرد صفحات أسخن يحتاجها التحليل التالي
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _PAGE_CACHE_MIN_BYTES:
+                return
+            # DONTNEED لا يُسقط الصفحات المتسخة، فتُكتب إلى القرص أولاً
+            os.fdatasync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+
 class EcommerceExporters:
+    # Parquet أولاً: الأسرع كتابةً والأصغر حجماً ويحفظ الأنواع؛ Excel للقراءة البشرية
+    SUPPORTED_FORMATS = ('parquet', 'feather', 'excel', 'csv')
+
     def __init__(self, output_dir: str = "exports"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def export_dataframe(self, df: pd.DataFrame, filename: str, format='excel', include_index=False):
+    def export_dataframe(self, df: pd.DataFrame, filename: str, format='excel', include_index=False,
+                         compression='zstd', compression_level=3, chunksize=65_536, csv_compression=None,
+                         fast=False):
+        if format not in self.SUPPORTED_FORMATS:
+            return {'success': False, 'message': f"unsupported format (use one of {', '.join(self.SUPPORTED_FORMATS)})"}
+        if format == 'csv' and csv_compression not in _CSV_SUFFIXES:
+            accepted = ', '.join(str(c) for c in _CSV_SUFFIXES)
+            return {'success': False, 'message': f"unsupported csv_compression (use one of {accepted})"}
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         base = self.output_dir / f"{filename}_{timestamp}"
+        args = (df, base, format, include_index, compression, compression_level, chunksize, csv_compression, fast)
         try:
-            if format == 'excel':
-                path = base.with_suffix('.xlsx')
-                with pd.ExcelWriter(path, engine='openpyxl') as writer:
-                    df.to_excel(writer, index=include_index, sheet_name='data')
-                return {'success': True, 'file_path': str(path), 'file_name': path.name}
-            elif format == 'csv':
-                path = base.with_suffix('.csv')
-                df.to_csv(path, index=include_index)
-                return {'success': True, 'file_path': str(path), 'file_name': path.name}
-            else:
-                return {'success': False, 'message': 'unsupported format'}
+            try:
+                path = self._write(*args)
+            except OSError:
+                # النسخة مخزنة عبر get_exporter وقد يُحذف المجلد أثناء عمل العملية: يُنشأ مجدداً ويُعاد التصدير مرة
+                if self.output_dir.is_dir():
+                    raise
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                path = self._write(*args)
+            _drop_page_cache(path)
+            return {'success': True, 'file_path': str(path), 'file_name': path.name}
         except Exception as e:
-            return {'success': False, 'message': str(e)}
\ No newline at end of file
+            return {'success': False, 'message': str(e)}
+
+    def _write(self, df: pd.DataFrame, base: Path, format, include_index, compression, compression_level,
+               chunksize, csv_compression, fast) -> Path:
+        if format == 'excel':
+            path = base.with_suffix('.xlsx')
+            if fast and len(df) >= _FAST_EXCEL_MIN_ROWS and self._write_excel_fast(df, path, include_index):
+                return path
+            # xlsxwriter يكتب XML مباشرة دون كائن Cell لكل خلية كما في openpyxl؛
+            # constant_memory غير مستخدم لأن pandas يكتب الخلايا عموداً عموداً فتضيع الصفوف السابقة
+            with pd.ExcelWriter(path, engine=_EXCEL_ENGINE) as writer:
+                df.to_excel(writer, index=include_index, sheet_name='data')
+        elif format == 'csv':
+            path = Path(f"{base}{_CSV_SUFFIXES[csv_compression]}")
+            # الكتابة على دفعات تحدّ من الذاكرة المؤقتة لنص الملف في الجداول الكبيرة
+            comp = {'method': csv_compression, 'level': 3} if csv_compression == 'zstd' else csv_compression
+            df.to_csv(path, index=include_index, chunksize=chunksize, compression=comp)
+        elif format == 'parquet':
+            path = base.with_suffix('.parquet')
+            self._write_parquet(df, path, include_index, compression, compression_level)
+        else:
+            path = base.with_suffix('.feather')
+            # Arrow IPC: يُقرأ لاحقاً بـ mmap دون فك ترميز، مناسب لإعادة القراءة من عمليات أخرى
+            table = pa.Table.from_pandas(df, preserve_index=include_index, nthreads=os.cpu_count())
+            feather.write_feather(table, path, compression=compression or 'uncompressed',
+                                  compression_level=compression_level if compression == 'zstd' else None)
+        return path
+
+    def _write_excel_fast(self, df: pd.DataFrame, path: Path, include_index: bool) -> bool:
+        # pyexcelerate اختياري: يكتب XML الورقة بمسار مترجم أسرع بعدة مرات للبيانات الخام دون تنسيق
+        try:
+            from pyexcelerate import Workbook, Style, Format
+        except ImportError:
+            return False
+        data = df.reset_index() if include_index else df
+        rows = data.astype(object).where(data.notna(), None).to_numpy().tolist()
+        wb = Workbook()
+        ws = wb.new_sheet('data', data=[[str(c) for c in data.columns]] + rows)
+        # التواريخ تُكتب أرقاماً تسلسلية، فتحتاج صيغة عرض صريحة للعمود
+        for i, col in enumerate(data.columns, start=1):
+            if pd.api.types.is_datetime64_any_dtype(data[col]):
+                ws.set_col_style(i, Style(format=Format('yyyy-mm-dd hh:mm:ss')))
+        wb.save(str(path))
+        return True
+
+    def _write_parquet(self, df: pd.DataFrame, path: Path, include_index: bool, compression, compression_level):
+        # ZSTD-3 أصغر من Snappy الافتراضي بتكلفة كتابة ضئيلة؛ compression=None للأقراص السريعة
+        # nthreads يحوّل الأعمدة إلى Arrow بالتوازي بدل عمود تلو الآخر
+        table = pa.Table.from_pandas(df, preserve_index=include_index, nthreads=os.cpu_count())
+        # BYTE_STREAM_SPLIT يفصل بايتات الأعداد العشرية فتنضغط أفضل، ويتعارض مع القاموس فيُخص به الباقي
+        floats = [str(c) for c in df.columns if pd.api.types.is_float_dtype(df[c])]
+        others = [name for name in table.column_names if name not in floats]
+        level = compression_level if compression in ('zstd', 'gzip', 'brotli') else None
+        pq.write_table(table, path, compression=compression, compression_level=level,
+                       use_dictionary=others, column_encoding={c: 'BYTE_STREAM_SPLIT' for c in floats},
+                       row_group_size=500_000, data_page_size=1 << 20, write_statistics=True,
+                       data_page_version='2.0')
+
+@lru_cache(maxsize=8)
+def get_exporter(output_dir: str = "exports") -> EcommerceExporters:
+    # المصدّر بلا حالة لكل استدعاء، فتُعاد نسخة واحدة لكل مجلد بدل mkdir عند كل تصدير
+    return EcommerceExporters(output_dir)
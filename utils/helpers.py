@@ -1,13 +1,81 @@
 # utils/helpers.py
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from importlib.util import find_spec
 from typing import Any
 
+# calamine (Rust) أسرع بكثير من openpyxl في قراءة xlsx/xls؛ اختياري ومدعوم في pandas منذ 2.2
+_PANDAS_VERSION = tuple(int(p) for p in pd.__version__.split('.')[:2])
+_EXCEL_READ_ENGINE = 'calamine' if find_spec('python_calamine') and _PANDAS_VERSION >= (2, 2) else None
+
+# قيم pandas الافتراضية للخلايا الفارغة (na_values) حتى يطابق مسار Arrow مسار read_csv
+_CSV_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                  '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
 def prepare_dataframe_display(df: pd.DataFrame, max_rows: int = 100):
     if len(df) > max_rows:
         return df.head(max_rows)
     return df
 
+def _skip_long_rows(row) -> str:
+    # on_bad_lines='skip' في pandas يتخطى الأسطر الزائدة فقط؛ الناقصة تُكمل بـ NaN عبر مسار pandas
+    return 'skip' if row.actual_columns > row.expected_columns else 'error'
+
+def _whole_beyond_float(column) -> bool:
+    # قيم صحيحة كلها وبعضها عند 2**53 أو فوقه حيث لا يميّز float64 بين الأعداد المتتالية
+    column = column.drop_null()
+    if len(column) == 0:
+        return False
+    return (pc.max(pc.abs(column)).as_py() >= 2 ** 53
+            and pc.all(pc.equal(pc.floor(column), column)).as_py())
+
+def _read_csv_arrow(file_obj, encoding: str):
+    # محلل Arrow متعدد الخيوط؛ None يعني الرجوع لمحلل pandas
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return None
+    try:
+        table = pacsv.read_csv(file_obj, read_options=pacsv.ReadOptions(encoding=encoding),
+                               parse_options=pacsv.ParseOptions(invalid_row_handler=_skip_long_rows),
+                               convert_options=pacsv.ConvertOptions(null_values=_CSV_NA_VALUES,
+                                                                    strings_can_be_null=True))
+    except pa.ArrowInvalid:
+        return None
+    # حالات يختلف فيها Arrow عن pandas فيُترك الملف لـ read_csv:
+    # بايتات غير صالحة بالترميز (أعمدة binary؛ pandas يرفع UnicodeDecodeError)، أوقات بإزاحة تتحول إلى UTC
+    # أو أوقات HH:MM:SS تصبح كائنات time (pandas يبقيهما نصاً)، أعمدة فارغة كلياً من نوع null (pandas يعطي float64)،
+    # وعناوين مكررة أو فارغة (pandas يعيد تسميتها x.1 و Unnamed: N)
+    types = table.schema.types
+    if any(pa.types.is_binary(t) or pa.types.is_large_binary(t) for t in types):
+        return None
+    if any((pa.types.is_timestamp(t) and t.tz is not None) or pa.types.is_time(t) or pa.types.is_null(t)
+           for t in types):
+        return None
+    names = table.column_names
+    if len(set(names)) != len(names) or '' in names:
+        return None
+    # أعداد صحيحة أكبر من int64 (معرفات طويلة) يقرؤها Arrow float64 فتندمج قيمها؛ pandas يبقيها uint64
+    if any(pa.types.is_floating(t) and _whole_beyond_float(table.column(i)) for i, t in enumerate(types)):
+        return None
+    # date_as_object=False يعيد أعمدة التاريخ datetime64 بدل كائنات date
+    return table.to_pandas(date_as_object=False)
+
+def read_uploaded_file(file_obj, file_type: str, encoding: str = 'utf-8') -> pd.DataFrame:
+    if file_type == 'csv':
+        df = _read_csv_arrow(file_obj, encoding)
+        if df is not None:
+            return df
+        file_obj.seek(0)
+        return pd.read_csv(file_obj, encoding=encoding, on_bad_lines='skip')
+    if file_type == 'excel':
+        return pd.read_excel(file_obj, engine=_EXCEL_READ_ENGINE)
+    if file_type == 'json':
+        return pd.read_json(file_obj)
+    raise ValueError(f"unsupported file type: {file_type}")
+
 def validate_file_upload(uploaded_file) -> dict:
     # wrapper to use EcommerceValidators if needed externally
     from .validators import EcommerceValidators
-    return EcommerceValidators.validate_file_upload(uploaded_file)
\ No newline at end of file
+    return EcommerceValidators.validate_file_upload(uploaded_file)
@@ -17,14 +17,16 @@ class Translator:
             'en':'Upload a CSV/Excel file with orders. Columns like order_id/order_date/total_amount help automatic mapping.'
         }
     }
+    # (اللغة، العبارة) -> الترجمة: بحث واحد في القاموس بدل فحص العضوية ثم الفهرسة على مستويين
+    _FLAT = {(lang, key): text for key, texts in MESSAGES.items() for lang, text in texts.items()}
 
     def translate(self, en_text: str, ar_text: str, lang='ar'):
         # usage: translate(en, ar) -> will return based on st.session_state.language if available
         import streamlit as st
         lang = st.session_state.get('language','ar')
-        key = en_text if en_text in self.MESSAGES else ar_text
-        if key in self.MESSAGES:
-            return self.MESSAGES[key].get(lang, key)
+        text = self._FLAT.get((lang, en_text)) or self._FLAT.get((lang, ar_text))
+        if text is not None:
+            return text
         return ar_text if lang=='ar' else en_text
 
 class LanguageManager: